@@ -1,12 +1,61 @@
+import sys
 from setuptools import setup, find_packages
+from setuptools.command.build_ext import build_ext
+
+
+class optional_build_ext(build_ext):
+    """
+    Сборка необязательного C-расширения: если компилятора нет или сборка не удалась,
+    пакет устанавливается без расширения и использует чистый Python.
+    """
+    def run(self):
+        try:
+            super().run()
+        except Exception as e:
+            self._skip(e)
+
+    def build_extension(self, ext):
+        try:
+            super().build_extension(ext)
+        except Exception as e:
+            self._skip(e, ext.name)
+
+    @staticmethod
+    def _skip(error, name='C-расширения'):
+        print(f'ПРЕДУПРЕЖДЕНИЕ: не удалось собрать {name} ({error}), используется чистый Python.', file=sys.stderr)
+
+
+try:
+    from Cython.Build import cythonize
+    ext_modules = cythonize(
+        ['yandex_neurosupport/_mask.py'],
+        language_level=3,
+        quiet=True,
+        # Аннотации в _mask.py - только документация, Cython не должен превращать их в проверки типов.
+        compiler_directives={'annotation_typing': False},
+    )
+except ImportError:
+    ext_modules = []
+except Exception as e:
+    optional_build_ext._skip(e)
+    ext_modules = []
 
 setup(
     name='yandex_neurosupport',
     version='0.1.0',
     packages=find_packages(),
+    ext_modules=ext_modules,
+    cmdclass={'build_ext': optional_build_ext},
     install_requires=[
         'requests>=2.25.0',
+        'urllib3>=1.26.0',
     ],
+    extras_require={
+        'orjson': ['orjson>=3.0'],
+        'hyperscan': ['hyperscan>=0.2'],
+        'ahocorasick': ['pyahocorasick>=1.4'],
+        'ijson': ['ijson>=3.1'],
+    },
     author='Timur Sukharev',
     author_email='tsukharev@yandex-team.ru',
     description='Клиент для Yandex NeuroSupport API: обертка для индексации документов и генеративных ответов',
@@ -0,0 +1,394 @@
+import gzip
+import io
+import json
+from types import SimpleNamespace
+
+import pytest
+import requests
+
+from yandex_neurosupport import APIError, YandexCloudNeuroSupportClient, mask_response_fields, serialize_document, utils
+from yandex_neurosupport import client as client_module
+
+
+@pytest.fixture
+def client():
+    return YandexCloudNeuroSupportClient('token', 'folder', 'service', 'product', base_url='https://api.test')
+
+
+@pytest.fixture
+def sent(client, monkeypatch):
+    """Подменяет `_request` и собирает отправленные запросы."""
+    calls = []
+
+    def _request(method, endpoint, **kwargs):
+        calls.append({'method': method, 'endpoint': endpoint, **kwargs})
+        return {'body': {'index_version': len(calls)}, 'headers': {}}
+
+    monkeypatch.setattr(client, '_request', _request)
+    return calls
+
+
+DOCUMENTS = [{'doc_id': str(i), 'text': f'text {i}'} for i in range(5)]
+
+
+@pytest.mark.parametrize('batch_size', [0, -1])
+def test_batch_size_must_be_positive(client, sent, batch_size):
+    with pytest.raises(ValueError):
+        client.create_or_update_index('idx', DOCUMENTS, diff=True, auto_switch=True, batch_size=batch_size)
+    assert sent == []
+
+
+@pytest.mark.parametrize('options', [
+    {},
+    {'diff': True},
+    {'auto_switch': True},
+    {'diff': False, 'auto_switch': True},
+    {'diff': True, 'auto_switch': False},
+    {'diff': True, 'auto_switch': True, 'index_version': 3},
+])
+def test_batches_require_incremental_update(client, sent, options):
+    with pytest.raises(ValueError):
+        client.create_or_update_index('idx', DOCUMENTS, batch_size=2, **options)
+    assert sent == []
+
+
+def test_single_request_when_documents_fit_in_batch(client, sent):
+    result = client.create_or_update_index('idx', DOCUMENTS, diff=True, auto_switch=True, batch_size=5)
+    assert len(sent) == 1
+    assert sent[0]['json']['documents'] == DOCUMENTS
+    assert result == {'body': {'index_version': 1}, 'headers': {}}
+
+
+def test_documents_are_sent_in_batches(client, sent):
+    result = client.create_or_update_index(
+        'idx', DOCUMENTS, meta={'a': 1}, diff=True, auto_switch=True, batch_size=2
+    )
+
+    assert [call['json']['documents'] for call in sent] == [DOCUMENTS[0:2], DOCUMENTS[2:4], DOCUMENTS[4:5]]
+    for call in sent:
+        assert call['method'] == 'POST'
+        assert call['endpoint'] == '/indexer/v1/indexes/idx/documents'
+        assert call['json']['meta'] == {'a': 1}
+        assert call['json']['diff'] is True and call['json']['auto_switch'] is True
+    assert result['body'] == {'index_version': 3}
+    assert [batch['body'] for batch in result['batches']] == [{'index_version': k} for k in (1, 2, 3)]
+
+
+def test_failed_batch_reports_applied_batches(client, monkeypatch):
+    calls = []
+
+    def _request(method, endpoint, **kwargs):
+        calls.append(kwargs['json']['documents'])
+        if len(calls) == 2:
+            raise APIError('Ошибка HTTP: 503', status_code=503, headers={'x-request-id': 'rid'})
+        return {'body': {}, 'headers': {}}
+
+    monkeypatch.setattr(client, '_request', _request)
+    with pytest.raises(APIError) as error:
+        client.create_or_update_index('idx', DOCUMENTS, diff=True, auto_switch=True, batch_size=2)
+
+    assert len(calls) == 2
+    assert 'пачки 2 из 3' in str(error.value)
+    assert 'уже применено пачек: 1' in str(error.value)
+    assert error.value.status_code == 503
+    assert error.value.headers == {'x-request-id': 'rid'}
+
+
+def _response(content, status_code=200, headers=None):
+    response = requests.Response()
+    response.status_code = status_code
+    response.raw = io.BytesIO(content)
+    response.headers.update(headers or {})
+    response.url = 'https://api.test'
+    return response
+
+
+def test_streamed_response_keeps_big_integers(client, monkeypatch):
+    response = _response(b'{"documents": [{"id": 1180591620717411303424}]}')
+    monkeypatch.setattr(client.session, 'request', lambda method, url, **kwargs: response)
+    _, body = client._send('GET', '/indexer/v1/indexes/idx/documents', stream=True)
+    assert body == {'documents': [{'id': 2 ** 70}]}
+
+
+@pytest.mark.skipif(utils.ijson is None, reason='ijson не установлен')
+def test_streamed_response_is_closed_on_invalid_json(client, monkeypatch):
+    response = _response(b'{"documents": [1, x' + b', 1' * 100000 + b']}')
+    requests_sent = []
+
+    def request(method, url, **kwargs):
+        requests_sent.append(kwargs)
+        return response
+
+    monkeypatch.setattr(client.session, 'request', request)
+    with pytest.raises(APIError, match='Некорректный JSON'):
+        client._send('GET', '/indexer/v1/indexes/idx/documents', stream=True)
+    assert response.raw.closed
+    assert len(requests_sent) == 1
+
+
+RESPONSE_HEADERS = {'Content-Type': 'application/json', 'Set-Cookie': 'session=secret', 'x-request-id': 'rid'}
+
+
+@pytest.fixture
+def responses(client, monkeypatch):
+    """Подменяет `session.request`: отвечает по очереди заданными ответами и собирает запросы."""
+    queue = []
+    sent = []
+
+    def request(method, url, **kwargs):
+        sent.append({'method': method, 'url': url, **kwargs})
+        return queue.pop(0)
+
+    monkeypatch.setattr(client.session, 'request', request)
+    return queue, sent
+
+
+@pytest.mark.parametrize('call', [
+    lambda client: client.get_index_info('idx'),
+    lambda client: client.get_index_info('idx', cache_ttl=60),
+    lambda client: client.delete_index('idx'),
+], ids=['request', 'cached_get', 'json_body'])
+def test_response_headers_are_plain_dict(client, responses, call):
+    queue, _ = responses
+    queue.append(_response(b'{"token": "secret"}', headers=RESPONSE_HEADERS))
+    result = call(client)
+
+    assert type(result['headers']) is dict
+    assert result['headers'] == RESPONSE_HEADERS
+    assert json.loads(json.dumps(result)) == result
+
+
+def test_response_headers_can_be_masked(client, responses):
+    queue, _ = responses
+    queue.append(_response(b'{"text": "my secret"}', headers=RESPONSE_HEADERS))
+    result = client.get_index_info('idx')
+
+    masked = mask_response_fields(result, keys_to_mask=['set-cookie'], values_to_mask=['rid'], placeholder='***')
+    assert masked['headers']['Set-Cookie'] == '***'
+    assert masked['headers']['x-request-id'] == '***'
+    assert masked['body'] == {'text': 'my secret'}
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Подменяет монотонные часы клиента; время двигается вручную через `clock.now`."""
+    fake = SimpleNamespace(now=1000.0)
+    monkeypatch.setattr(client_module, 'time', SimpleNamespace(monotonic=lambda: fake.now))
+    return fake
+
+
+def _info(version, etag=None, cache_control=None):
+    headers = {'Content-Type': 'application/json'}
+    if etag:
+        headers['ETag'] = etag
+    if cache_control:
+        headers['Cache-Control'] = cache_control
+    return _response(b'{"index_version": %d}' % version, headers=headers)
+
+
+def _not_modified(etag):
+    return _response(b'', status_code=304, headers={'ETag': etag})
+
+
+def test_cache_returns_fresh_entry_without_request(client, responses, clock):
+    queue, sent = responses
+    queue.append(_info(1))
+    first = client.get_index_info('idx', cache_ttl=10)
+    clock.now += 9
+    second = client.get_index_info('idx', cache_ttl=10)
+
+    assert len(sent) == 1
+    assert first == second == {'body': {'index_version': 1}, 'headers': {'Content-Type': 'application/json'}}
+
+
+def test_cache_is_not_used_without_ttl(client, responses, clock):
+    queue, sent = responses
+    queue.extend([_info(1), _info(2), _info(3)])
+    client.get_index_info('idx', cache_ttl=10)
+    assert client.get_index_info('idx')['body'] == {'index_version': 2}
+    assert client.get_index_info('idx')['body'] == {'index_version': 3}
+    assert len(sent) == 3
+
+
+def test_cache_keys_include_arguments(client, responses, clock):
+    queue, sent = responses
+    queue.extend([_info(1), _info(2)])
+    assert client.get_index_info('idx', cache_ttl=10)['body'] == {'index_version': 1}
+    assert client.get_index_info('idx', index_version=2, cache_ttl=10)['body'] == {'index_version': 2}
+    assert client.get_index_info('idx', cache_ttl=10)['body'] == {'index_version': 1}
+    assert len(sent) == 2
+
+
+def test_expired_entry_without_etag_is_refetched(client, responses, clock):
+    queue, sent = responses
+    queue.extend([_info(1), _info(2)])
+    client.get_index_info('idx', cache_ttl=10)
+    clock.now += 10
+    assert client.get_index_info('idx', cache_ttl=10)['body'] == {'index_version': 2}
+    assert 'If-None-Match' not in sent[1].get('headers', {})
+
+
+def test_expired_entry_is_revalidated_with_etag(client, responses, clock):
+    queue, sent = responses
+    queue.extend([_info(1, etag='"v1"'), _not_modified('"v1"'), _info(2, etag='"v2"')])
+    first = client.get_index_info('idx', cache_ttl=10)
+    clock.now += 11
+    assert client.get_index_info('idx', cache_ttl=10) == first
+    assert sent[1]['headers']['If-None-Match'] == '"v1"'
+
+    clock.now += 5
+    assert client.get_index_info('idx', cache_ttl=10) == first
+    assert len(sent) == 2
+
+    clock.now += 6
+    assert client.get_index_info('idx', cache_ttl=10)['body'] == {'index_version': 2}
+    assert sent[2]['headers']['If-None-Match'] == '"v1"'
+    assert client._response_cache[next(iter(client._response_cache))][2] == '"v2"'
+
+
+def test_modifying_index_request_invalidates_cache(client, responses, clock):
+    queue, sent = responses
+    queue.extend([_info(1), _info(0), _info(2)])
+    client.get_index_info('idx', cache_ttl=10)
+    client.switch_index_version('idx', 2)
+    assert client.get_index_info('idx', cache_ttl=10)['body'] == {'index_version': 2}
+    assert len(sent) == 3
+
+
+def test_answer_request_keeps_cache(client, responses, clock):
+    queue, sent = responses
+    queue.extend([_info(1), _response(b'{"answers": []}')])
+    client.get_index_info('idx', cache_ttl=10)
+    client.get_generative_answer('idx', [{'role': 'client', 'text': 'q'}])
+    assert client.get_index_info('idx', cache_ttl=10)['body'] == {'index_version': 1}
+    assert len(sent) == 2
+
+
+def test_cache_evicts_least_recently_used(client, responses, clock, monkeypatch):
+    monkeypatch.setattr(client_module, 'RESPONSE_CACHE_SIZE', 2)
+    queue, sent = responses
+    queue.extend([_info(1), _info(2), _info(3), _info(4)])
+    client.get_index_info('idx', index_version=1, cache_ttl=10)
+    client.get_index_info('idx', index_version=2, cache_ttl=10)
+    client.get_index_info('idx', index_version=1, cache_ttl=10)
+    client.get_index_info('idx', index_version=3, cache_ttl=10)
+    assert len(sent) == 3
+
+    assert client.get_index_info('idx', index_version=1, cache_ttl=10)['body'] == {'index_version': 1}
+    assert len(sent) == 3
+    assert client.get_index_info('idx', index_version=2, cache_ttl=10)['body'] == {'index_version': 4}
+    assert len(sent) == 4
+
+
+def test_cached_results_are_isolated_copies(client, responses, clock):
+    queue, sent = responses
+    queue.extend([_info(1, etag='"v1"'), _not_modified('"v1"')])
+    expected = client.get_index_info('idx', cache_ttl=10)
+    expected = json.loads(json.dumps(expected))
+
+    first = client.get_index_info('idx', cache_ttl=10)
+    first['body']['index_version'] = 100
+    first['headers'].clear()
+    assert client.get_index_info('idx', cache_ttl=10) == expected
+
+    clock.now += 11
+    revalidated = client.get_index_info('idx', cache_ttl=10)
+    revalidated['body']['index_version'] = 200
+    assert client.get_index_info('idx', cache_ttl=10) == expected
+    assert len(sent) == 2
+
+
+def test_miss_result_is_not_shared_with_cache(client, responses, clock):
+    queue, _ = responses
+    queue.append(_info(1))
+    client.get_index_info('idx', cache_ttl=10)['body']['index_version'] = 100
+    assert client.get_index_info('idx', cache_ttl=10)['body'] == {'index_version': 1}
+
+
+def test_no_store_response_is_not_cached(client, responses, clock):
+    queue, sent = responses
+    queue.extend([_info(1), _info(2, cache_control='no-store'), _info(3)])
+    client.get_index_info('idx', cache_ttl=10)
+    clock.now += 11
+    assert client.get_index_info('idx', cache_ttl=10)['body'] == {'index_version': 2}
+    assert client.get_index_info('idx', cache_ttl=10)['body'] == {'index_version': 3}
+    assert len(sent) == 3
+
+
+def test_no_cache_response_is_revalidated_every_time(client, responses, clock):
+    queue, sent = responses
+    queue.extend([
+        _info(1, etag='"v1"', cache_control='private, no-cache'),
+        _not_modified('"v1"'),
+        _not_modified('"v1"'),
+    ])
+    first = client.get_index_info('idx', cache_ttl=10)
+    assert client.get_index_info('idx', cache_ttl=10) == first
+    assert client.get_index_info('idx', cache_ttl=10) == first
+    assert [request.get('headers', {}).get('If-None-Match') for request in sent] == [None, '"v1"', '"v1"']
+
+
+def test_no_cache_response_without_etag_is_not_cached(client, responses, clock):
+    queue, sent = responses
+    queue.extend([_info(1, cache_control='no-cache'), _info(2)])
+    client.get_index_info('idx', cache_ttl=10)
+    assert client.get_index_info('idx', cache_ttl=10)['body'] == {'index_version': 2}
+    assert client.get_index_info('idx', cache_ttl=10)['body'] == {'index_version': 2}
+    assert len(sent) == 2
+
+
+def test_max_age_shortens_ttl(client, responses, clock):
+    queue, sent = responses
+    queue.extend([_info(1, cache_control='max-age=5'), _info(2)])
+    client.get_index_info('idx', cache_ttl=10)
+    clock.now += 4
+    assert client.get_index_info('idx', cache_ttl=10)['body'] == {'index_version': 1}
+    clock.now += 1
+    assert client.get_index_info('idx', cache_ttl=10)['body'] == {'index_version': 2}
+    assert len(sent) == 2
+
+
+MIXED_DOCUMENTS = [
+    {'doc_id': '0', 'text': 'обычный документ'},
+    serialize_document({'doc_id': '1', 'text': 'сериализованный'}),
+    serialize_document({'doc_id': '2', 'id': 2 ** 70}),
+    {'doc_id': '3', 'text': 'x' * 2000},
+    serialize_document({'doc_id': '4', 'text': 'y' * 2000}),
+]
+PLAIN_DOCUMENTS = [json.loads(d) if isinstance(d, bytes) else d for d in MIXED_DOCUMENTS]
+
+
+def _sent_body(request):
+    data = request['data']
+    if request['headers'].get('Content-Encoding') == 'gzip':
+        data = gzip.decompress(data)
+    return json.loads(data)
+
+
+def test_pre_serialized_documents_are_sent_in_batches(client, responses):
+    queue, sent = responses
+    queue.extend(_response(b'{}') for _ in range(3))
+    client.create_or_update_index('idx', MIXED_DOCUMENTS, meta={'a': 1}, diff=True, auto_switch=True, batch_size=2)
+
+    expected = {'service': 'service', 'product': 'product', 'meta': {'a': 1}, 'auto_switch': True, 'diff': True}
+    assert [_sent_body(request) for request in sent] == [
+        {**expected, 'documents': PLAIN_DOCUMENTS[0:2]},
+        {**expected, 'documents': PLAIN_DOCUMENTS[2:4]},
+        {**expected, 'documents': PLAIN_DOCUMENTS[4:5]},
+    ]
+    assert all(request['headers']['Content-Type'] == 'application/json' for request in sent)
+
+
+@pytest.mark.parametrize('documents', [MIXED_DOCUMENTS, PLAIN_DOCUMENTS], ids=['mixed', 'dicts'])
+def test_compressed_request_body(client, responses, documents):
+    client.compress_requests = True
+    queue, sent = responses
+    queue.extend([_response(b'{}'), _response(b'{}')])
+
+    client.create_or_update_index('idx', documents, diff=True)
+    client.create_or_update_index('idx', documents[:1], diff=True)
+
+    assert sent[0]['headers']['Content-Encoding'] == 'gzip'
+    assert _sent_body(sent[0]) == {'service': 'service', 'product': 'product', 'documents': PLAIN_DOCUMENTS, 'diff': True}
+    assert 'Content-Encoding' not in sent[1]['headers']
+    assert _sent_body(sent[1])['documents'] == PLAIN_DOCUMENTS[:1]
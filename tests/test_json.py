@@ -0,0 +1,147 @@
+import json
+import math
+
+import pytest
+
+from yandex_neurosupport import utils
+from yandex_neurosupport.utils import _dumps_request_body, _json_dumps, _json_load_chunks, _json_loads, serialize_document
+
+
+@pytest.fixture(params=['orjson', 'json'])
+def json_backend(request, monkeypatch):
+    """Прогоняет тест с orjson (если он установлен) и со стандартным json."""
+    if request.param == 'orjson':
+        if utils.orjson is None:
+            pytest.skip('orjson не установлен')
+    else:
+        monkeypatch.setattr(utils, 'orjson', None)
+    return request.param
+
+
+INTEGERS = [
+    0,
+    -1,
+    2 ** 63 - 1,
+    -2 ** 63,
+    2 ** 63,
+    -2 ** 63 - 1,
+    2 ** 64 - 1,
+    2 ** 64,
+    -2 ** 64,
+    -9999999999999999999,
+    9999999999999999999,
+    10 ** 30,
+    -10 ** 30,
+]
+
+
+@pytest.mark.parametrize('number', INTEGERS)
+def test_integers_round_trip_exactly(json_backend, number):
+    data = {'id': number, 'items': [number]}
+    encoded = _json_dumps(data)
+    assert json.loads(encoded) == data
+    decoded = _json_loads(encoded)
+    assert decoded == data
+    assert type(decoded['id']) is int
+
+
+@pytest.mark.parametrize('number', INTEGERS)
+def test_loads_integers_next_to_floats(json_backend, number):
+    assert _json_loads(b'[%d, 1.5]' % number) == [number, 1.5]
+
+
+def test_dumps_is_compact_utf8(json_backend):
+    assert _json_dumps({'text': 'привет', 'n': [1, 2]}) == '{"text":"привет","n":[1,2]}'.encode('utf-8')
+
+
+@pytest.mark.parametrize('data, expected', [
+    (b'1e400', math.inf),
+    (b'-1e400', -math.inf),
+    (b'Infinity', math.inf),
+])
+def test_loads_accepts_what_stdlib_accepts(json_backend, data, expected):
+    assert _json_loads(data) == expected
+
+
+def test_loads_accepts_nan(json_backend):
+    assert math.isnan(_json_loads(b'{"a": NaN}')['a'])
+
+
+def test_loads_rejects_invalid_json(json_backend):
+    with pytest.raises(ValueError):
+        _json_loads(b'{"a": ')
+
+
+def test_dumps_nan(json_backend):
+    if json_backend == 'orjson':
+        assert _json_dumps({'a': math.nan}) == b'{"a":null}'
+    else:
+        with pytest.raises(ValueError):
+            _json_dumps({'a': math.nan})
+
+
+@pytest.fixture(params=['ijson', 'buffered'])
+def chunks_backend(request, monkeypatch):
+    """Прогоняет тест с инкрементальным разбором через ijson и без ijson."""
+    if request.param == 'ijson':
+        if utils.ijson is None:
+            pytest.skip('ijson не установлен')
+    else:
+        monkeypatch.setattr(utils, 'ijson', None)
+    return request.param
+
+
+def _split(data, size):
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+def test_load_chunks_empty_stream(chunks_backend):
+    assert _json_load_chunks([]) is None
+    assert _json_load_chunks([b'', b'']) is None
+
+
+@pytest.mark.parametrize('size', [1, 2, 3, 7, 1000])
+def test_load_chunks_split_mid_token(chunks_backend, size):
+    data = {'text': 'привет', 'n': [1, -2.5, True, None], 'id': 2 ** 70, 'neg': -2 ** 70}
+    encoded = json.dumps(data, ensure_ascii=False).encode('utf-8')
+    assert _json_load_chunks(_split(encoded, size)) == data
+
+
+@pytest.mark.parametrize('data', [b'42', b'"text"', b'null', b'true', b'-1.5', b'18446744073709551616'])
+def test_load_chunks_top_level_scalar(chunks_backend, data):
+    assert _json_load_chunks(_split(data, 1)) == json.loads(data)
+
+
+def test_load_chunks_keeps_big_integers_exact(chunks_backend):
+    result = _json_load_chunks([b'{"a": 11805916207174113034', b'24, "b": -9999999999999999999}'])
+    assert result == {'a': 2 ** 70, 'b': -9999999999999999999}
+
+
+@pytest.mark.parametrize('data', [b'{"a": ', b'{"a": 1}}', b'[1, 2'])
+def test_load_chunks_rejects_invalid_json(chunks_backend, data):
+    with pytest.raises(ValueError):
+        _json_load_chunks(_split(data, 2))
+
+
+def _plain(body):
+    """Тело запроса с заранее сериализованными документами, разобранными обратно в dict."""
+    documents = [json.loads(d) if isinstance(d, bytes) else d for d in body.get('documents', [])]
+    return {**body, 'documents': documents} if 'documents' in body else body
+
+
+DOCUMENT_BODIES = [
+    {'documents': [serialize_document({'doc_id': '1', 'text': 'привет'})]},
+    {'documents': [serialize_document({'doc_id': '1'}), serialize_document({'doc_id': '2', 'n': 2 ** 70})]},
+    {'service': 's', 'product': 'p', 'documents': [{'doc_id': '1'}, serialize_document({'doc_id': '2'}), {'doc_id': '3'}]},
+    {'documents': [serialize_document({'doc_id': '1'})], 'meta': {'a': [1, 2]}, 'diff': True},
+    {'service': 's', 'documents': [{'doc_id': '1', 'text': 'x'}]},
+    {'service': 's', 'documents': []},
+    {'service': 's'},
+]
+
+
+@pytest.mark.parametrize('body', DOCUMENT_BODIES)
+def test_request_body_splices_pre_serialized_documents(json_backend, body):
+    encoded = _dumps_request_body(body)
+    assert json.loads(encoded) == json.loads(json.dumps(_plain(body)))
+    assert json.loads(encoded) == _json_loads(_json_dumps(_plain(body)))
@@ -0,0 +1,83 @@
+import random
+
+import pytest
+
+from yandex_neurosupport import utils
+from yandex_neurosupport.utils import mask_response_fields
+
+
+BACKENDS = ['re', 'ahocorasick', 'hyperscan']
+
+UNICODE_CASES = [
+    ('ſecret Secret SECRET', ['s']),
+    ('ıstanbul İstanbul ISTANBUL istanbul', ['istanbul']),
+    ('Straße STRASSE strasse', ['straße', 'ss']),
+    ('Привет, МИР! мир Мир', ['мир']),
+    ('µ μ Μ', ['μ']),
+    ('ς σ Σ', ['σ']),
+    ('ᲃ с С', ['с']),
+    ('ſ s S', ['ſ']),
+    ('İ i̇ I i', ['i̇']),
+]
+
+FUZZ_ALPHABET = 'sSſıiIİßкКᲃсС abµμςσΣ'
+
+
+@pytest.fixture
+def use_backend(monkeypatch):
+    """Оставляет доступной только указанную реализацию маскирования значений."""
+    modules = {'hyperscan': utils.hyperscan, 'ahocorasick': utils.ahocorasick}
+
+    def _use(backend):
+        if backend != 're' and modules[backend] is None:
+            pytest.skip(f'{backend} не установлен')
+        for name, module in modules.items():
+            monkeypatch.setattr(utils, name, module if name == backend else None)
+        utils._value_masker.cache_clear()
+
+    yield _use
+    utils._value_masker.cache_clear()
+
+
+def _mask_with(use_backend, backend, data, values, placeholder='***'):
+    use_backend(backend)
+    try:
+        return mask_response_fields(data, values_to_mask=values, placeholder=placeholder)
+    finally:
+        utils._value_masker.cache_clear()
+
+
+@pytest.mark.parametrize('backend', BACKENDS)
+def test_masks_values_case_insensitively(use_backend, backend):
+    data = {'text': 'Password PASSWORD password and password123', 'items': ['my-secret-product', 1]}
+    result = _mask_with(use_backend, backend, data, ['password', 'my-secret'])
+    assert result == {'text': '*** *** *** and ***123', 'items': ['***-product', 1]}
+
+
+@pytest.mark.parametrize('backend', BACKENDS)
+def test_overlapping_values_follow_list_order(use_backend, backend):
+    assert _mask_with(use_backend, backend, 'abcd abc ab', ['ab', 'abc', 'bcd']) == '***cd ***c ***'
+    assert _mask_with(use_backend, backend, 'abcd abc ab', ['abc', 'ab', 'bcd']) == '***d *** ***'
+
+
+@pytest.mark.parametrize('backend', BACKENDS)
+def test_placeholder_is_inserted_literally(use_backend, backend):
+    result = _mask_with(use_backend, backend, 'token=abc', ['abc'], placeholder='\\1\\g<0>')
+    assert result == 'token=\\1\\g<0>'
+
+
+@pytest.mark.parametrize('backend', BACKENDS)
+@pytest.mark.parametrize('text, values', UNICODE_CASES)
+def test_unicode_case_folding_matches_re(use_backend, backend, text, values):
+    expected = _mask_with(use_backend, 're', text, values)
+    assert _mask_with(use_backend, backend, text, values) == expected
+
+
+@pytest.mark.parametrize('backend', BACKENDS)
+def test_random_strings_match_re(use_backend, backend):
+    rng = random.Random(0)
+    for _ in range(200):
+        text = ''.join(rng.choices(FUZZ_ALPHABET, k=rng.randint(0, 30)))
+        values = [''.join(rng.choices(FUZZ_ALPHABET, k=rng.randint(1, 3))) for _ in range(rng.randint(1, 3))]
+        expected = _mask_with(use_backend, 're', text, values)
+        assert _mask_with(use_backend, backend, text, values) == expected, (text, values)
@@ -1,3 +1,3 @@
 from .client import YandexCloudNeuroSupportClient, BaseClient
 from .exceptions import APIError, AuthenticationError
-from .utils import get_iam_token, get_folder_id, get_index_name, get_product, get_service, mask_response_fields
\ No newline at end of file
+from .utils import get_iam_token, get_folder_id, get_index_name, get_product, get_service, mask_response_fields, serialize_document, PreSerializedDoc
\ No newline at end of file
@@ -0,0 +1,58 @@
+"""
+Обход данных для `mask_response_fields`.
+
+Модуль написан на чистом Python, но при установке из исходников с Cython
+компилируется в расширение (см. setup.py). Если скомпилированного модуля нет,
+используется этот же код в интерпретаторе. Аннотации Cython не проверяет,
+поэтому оба варианта принимают одни и те же аргументы.
+"""
+from typing import AbstractSet, Any, Callable, List, Optional
+
+
+def mask_tree(
+    data: Any,
+    lower_keys_to_mask: AbstractSet[str],
+    value_masker: Optional[Callable[[str], str]],
+    placeholder: Any
+) -> Any:
+    """
+    Маскирует данные: значения ключей из `lower_keys_to_mask` заменяются на `placeholder`,
+    строки пропускаются через `value_masker`. Обход в глубину с явным стеком:
+    (узел, итератор по детям, изменения, ключ в родителе). Контейнер копируется,
+    только если в нем что-то поменялось (copy-on-write).
+    """
+    if not isinstance(data, (dict, list)):
+        if value_masker is not None and isinstance(data, str):
+            return value_masker(data)
+        return data
+
+    stack: List[tuple] = [(data, iter(data.items()) if isinstance(data, dict) else enumerate(data), {}, None)]
+    while True:
+        node, children, changes, key_in_parent = stack[-1]
+        is_dict = isinstance(node, dict)
+        for key, child in children:
+            if is_dict and key.lower() in lower_keys_to_mask:
+                changes[key] = placeholder
+            elif isinstance(child, dict):
+                stack.append((child, iter(child.items()), {}, key))
+                break
+            elif isinstance(child, list):
+                stack.append((child, enumerate(child), {}, key))
+                break
+            elif value_masker is not None and isinstance(child, str):
+                masked = value_masker(child)
+                if masked is not child:
+                    changes[key] = masked
+        else:
+            stack.pop()
+            if changes:
+                if is_dict:
+                    node = {**node, **changes}
+                else:
+                    node = list(node)
+                    for index, value in changes.items():
+                        node[index] = value
+            if not stack:
+                return node
+            if changes:
+                stack[-1][2][key_in_parent] = node
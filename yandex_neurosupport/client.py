@@ -1,19 +1,81 @@
+import copy
+import gzip
+import threading
+import time
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any, Union, Optional
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Union, Optional, ClassVar, Tuple, Callable
 from .exceptions import APIError, AuthenticationError
+from .utils import _dumps_request_body, _json_dumps, _json_loads, _json_load_chunks, PreSerializedDoc
+
+POOL_CONNECTIONS = 32
+POOL_MAXSIZE = 64
+RETRY_STATUS_CODES = (429, 502, 503, 504)
+# Повторяются только чтения: POST и DELETE создают новую версию индекса
+# или запускают генерацию, и повтор после таймаута выполнил бы их дважды.
+RETRY_METHODS = frozenset(['GET'])
+STREAM_CHUNK_SIZE = 64 * 1024
+RESPONSE_CACHE_SIZE = 256
+ANSWER_TIMEOUT = 60
+ERROR_DETAILS_LIMIT = 512
+COMPRESS_MIN_SIZE = 1024
+
+INDEXES_ENDPOINT = '/indexer/v1/indexes'
+ANSWER_ENDPOINT = '/api/v1/answer'
+
+class _SharedPoolAdapter(HTTPAdapter):
+    """
+    HTTPAdapter, который подключается ко всем сессиям клиентов и держит общий пул соединений.
+    Пул живет до завершения процесса: закрытие сессии одного клиента не закрывает
+    соединения остальных.
+    """
+    def close(self):
+        pass
+
+def _cache_ttl_from_cache_control(cache_control: str, cache_ttl: float) -> Optional[float]:
+    """
+    Срок хранения ответа в кэше с учетом заголовка Cache-Control: None при `no-store`
+    (не кэшировать), 0 при `no-cache` (перепроверять каждый раз), `max-age` ограничивает `cache_ttl`.
+    """
+    directives = {}
+    for directive in cache_control.split(','):
+        name, _, value = directive.strip().partition('=')
+        directives[name.lower()] = value.strip('"')
+    if 'no-store' in directives:
+        return None
+    if 'no-cache' in directives:
+        return 0.0
+    max_age = directives.get('max-age', '')
+    if max_age.isdigit():
+        return min(cache_ttl, int(max_age))
+    return cache_ttl
+
+def _without_none(**fields: Any) -> Dict[str, Any]:
+    """Собирает тело или параметры запроса, отбрасывая поля со значением None."""
+    return {key: value for key, value in fields.items() if value is not None}
 
 class BaseClient(ABC):
     """
     Абстрактный базовый клиент, содержащий общую логику для запросов к API.
     Механизм аутентификации и предоставление специфичных параметров (например, folder_id)
     должны быть реализованы в дочерних классах.
+
+    У каждого клиента своя HTTP-сессия (заголовки, cookies), а пул соединений
+    (HTTPAdapter) общий для всех клиентов процесса.
     """
+    _adapter: ClassVar[Optional[HTTPAdapter]] = None
+    _adapter_lock: ClassVar[threading.Lock] = threading.Lock()
+
     def __init__(
         self,
         service: str,
         product: str,
-        base_url: str = "https://supportgpt.api.cloud.yandex.net"
+        base_url: str = "https://supportgpt.api.cloud.yandex.net",
+        compress_requests: bool = False
     ):
         """
         Инициализирует клиент API.
@@ -22,6 +84,7 @@ class BaseClient(ABC):
             service: Идентификатор сервиса. Выдается после обработки заявки на подключение (обязательный).
             product: Идентификатор продукта. Выдается после обработки заявки на подключение(обязательный).
             base_url: Базовый URL API (по умолчанию "https://supportgpt.api.cloud.yandex.net").
+            compress_requests: Сжимать gzip тела запросов больше 1 КБ (например, при загрузке документов).
 
         Raises:
             TypeError: Если обязательные параметры не переданы.
@@ -29,9 +92,33 @@ class BaseClient(ABC):
         self.service = service
         self.product = product
         self.base_url = base_url
+        self.compress_requests = compress_requests
         self.session = requests.Session()
+        adapter = self._get_adapter()
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self._response_cache: 'OrderedDict[Tuple, Tuple[Dict[str, Any], float, Optional[str], str]]' = OrderedDict()
+        self._response_cache_lock = threading.Lock()
         self._configure_auth()
 
+    @classmethod
+    def _get_adapter(cls) -> HTTPAdapter:
+        """Возвращает общий адаптер с настроенным пулом соединений, создавая его при первом обращении."""
+        with cls._adapter_lock:
+            if BaseClient._adapter is None:
+                BaseClient._adapter = _SharedPoolAdapter(
+                    pool_connections=POOL_CONNECTIONS,
+                    pool_maxsize=POOL_MAXSIZE,
+                    max_retries=Retry(
+                        total=3,
+                        backoff_factor=0.3,
+                        status_forcelist=RETRY_STATUS_CODES,
+                        allowed_methods=RETRY_METHODS,
+                        raise_on_status=False,
+                    ),
+                )
+            return BaseClient._adapter
+
     @abstractmethod
     def _configure_auth(self):
         """
@@ -40,20 +127,153 @@ class BaseClient(ABC):
         """
         raise NotImplementedError("Метод аутентификации должен быть реализован в дочернем классе.")
 
-    def _request(self, method: str, endpoint: str, **kwargs) -> Dict[str, Any]:
-        """Унифицированный метод для запросов. Возвращает {'body': dict or None, 'headers': dict}."""
+    def _send(self, method: str, endpoint: str, **kwargs) -> Tuple[requests.Response, Any]:
+        """
+        Выполняет запрос и возвращает ответ requests вместе с разобранным телом.
+        При `stream=True` тело ответа разбирается по мере загрузки, без буферизации целиком,
+        и соединение закрывается, даже если разбор не удался.
+        Любой изменяющий запрос к индексам (не GET) сбрасывает кэш ответов клиента.
+        """
         url = f"{self.base_url}{endpoint}"
-        response = self.session.request(method, url, **kwargs)
+        extra_headers = kwargs.get('headers')
+        if kwargs.get('json') is not None:
+            data = _dumps_request_body(kwargs.pop('json'))
+            content_headers = {'Content-Type': 'application/json'}
+            if self.compress_requests and len(data) > COMPRESS_MIN_SIZE:
+                data = gzip.compress(data, compresslevel=1)
+                content_headers['Content-Encoding'] = 'gzip'
+            kwargs['data'] = data
+            kwargs['headers'] = {**content_headers, **(extra_headers or {})}
+        if method != 'GET' and self._response_cache and endpoint.startswith(INDEXES_ENDPOINT):
+            with self._response_cache_lock:
+                self._response_cache.clear()
         try:
-            response.raise_for_status()
-            body = response.json() if response.content else None
-            headers = dict(response.headers)
-            return {'body': body, 'headers': headers}
-        except requests.HTTPError as e:
-            error_details = e.response.text
-            raise APIError(f"Ошибка HTTP: {e} - {error_details}")
+            response = self.session.request(method, url, **kwargs)
+            self._raise_for_status(response)
+            if kwargs.get('stream'):
+                with response:
+                    return response, _json_load_chunks(response.iter_content(STREAM_CHUNK_SIZE))
+            body = _json_loads(response.content) if response.content else None
+            return response, body
         except requests.RequestException as e:
             raise APIError(f"Ошибка сети или подключения: {e}")
+        except ValueError as e:
+            raise APIError(f"Некорректный JSON в ответе: {e}")
+
+    @staticmethod
+    def _raise_for_status(response: requests.Response) -> None:
+        """Выбрасывает APIError, если сервер ответил кодом ошибки."""
+        if response.status_code >= 400:
+            error_details = response.content[:ERROR_DETAILS_LIMIT].decode('utf-8', 'replace')
+            raise APIError(
+                f"Ошибка HTTP: {response.status_code} {response.reason} for url: {response.url} - {error_details}",
+                status_code=response.status_code,
+                headers=response.headers,
+            )
+
+    def _request(self, method: str, endpoint: str, **kwargs) -> Dict[str, Any]:
+        """
+        Унифицированный метод для запросов. Возвращает {'body': dict or None, 'headers': dict}.
+        Заголовки копируются в обычный dict, чтобы результат можно было сериализовать
+        в JSON и маскировать через `mask_response_fields`.
+        """
+        response, body = self._send(method, endpoint, **kwargs)
+        return {'body': body, 'headers': dict(response.headers)}
+
+    def _cached_get(self, endpoint: str, cache_ttl: Optional[float], **kwargs) -> Dict[str, Any]:
+        """
+        GET-запрос с кэшированием ответа на `cache_ttl` секунд.
+
+        Пока запись свежая, ответ возвращается без обращения к API. После истечения срока,
+        если сервер прислал ETag, отправляется условный запрос с If-None-Match, и при ответе
+        304 возвращается закэшированный ответ. Без `cache_ttl` кэш не используется.
+        Заголовок Cache-Control ответа учитывается: `no-store` отключает кэширование ответа,
+        `no-cache` требует перепроверки через ETag при каждом запросе, `max-age` сокращает срок.
+        Кэш хранит свою копию ответа и каждый раз отдает новую, поэтому изменения
+        возвращенного словаря не попадают в кэш.
+        """
+        if cache_ttl is None:
+            return self._request(method='GET', endpoint=endpoint, **kwargs)
+
+        key = (endpoint, _json_dumps(kwargs.get('json')), _json_dumps(kwargs.get('params')))
+        with self._response_cache_lock:
+            entry = self._response_cache.get(key)
+            if entry is not None:
+                self._response_cache.move_to_end(key)
+        if entry is not None:
+            cached, expires_at, etag, cache_control = entry
+            if time.monotonic() < expires_at:
+                return copy.deepcopy(cached)
+            if etag:
+                kwargs['headers'] = {**kwargs.get('headers', {}), 'If-None-Match': etag}
+
+        response, body = self._send('GET', endpoint, **kwargs)
+        if entry is not None and response.status_code == 304:
+            stored = cached
+            result = copy.deepcopy(cached)
+            # 304 может не повторять Cache-Control - тогда действует заголовок исходного ответа.
+            cache_control = response.headers.get('Cache-Control', cache_control)
+        else:
+            result = {'body': body, 'headers': dict(response.headers)}
+            stored = None
+            etag = response.headers.get('ETag')
+            cache_control = response.headers.get('Cache-Control', '')
+        ttl = _cache_ttl_from_cache_control(cache_control, cache_ttl)
+        if ttl is None or (ttl <= 0 and not etag):
+            with self._response_cache_lock:
+                self._response_cache.pop(key, None)
+            return result
+        if stored is None:
+            stored = copy.deepcopy(result)
+        with self._response_cache_lock:
+            self._response_cache[key] = (stored, time.monotonic() + ttl, etag, cache_control)
+            self._response_cache.move_to_end(key)
+            while len(self._response_cache) > RESPONSE_CACHE_SIZE:
+                self._response_cache.popitem(last=False)
+        return result
+
+    def run_concurrently(
+        self,
+        calls: List[Callable[[], Any]],
+        max_concurrency: int = 8
+    ) -> List[Any]:
+        """
+        Выполняет несколько вызовов методов клиента параллельно в пуле потоков.
+
+        Вызовы используют общий пул соединений клиента, поэтому независимые запросы
+        к API не ждут друг друга.
+
+        Args:
+            calls: Список функций без аргументов, каждая из которых выполняет один запрос.
+            max_concurrency: Максимальное количество одновременных запросов.
+
+        Returns:
+            Список результатов в том же порядке, что и `calls`.
+
+        Raises:
+            APIError: При ошибке любого из запросов.
+
+        Example:
+        info, docs = client.run_concurrently([
+            lambda: client.get_index_info(index_name='my-index'),
+            lambda: client.get_documents_from_index(index_name='my-index', limit=10),
+        ])
+        """
+        if len(calls) <= 1 or max_concurrency <= 1:
+            return [call() for call in calls]
+        with ThreadPoolExecutor(max_workers=min(max_concurrency, len(calls))) as executor:
+            return list(executor.map(lambda call: call(), calls))
+
+    def _request_concurrently(
+        self,
+        calls: List[Dict[str, Any]],
+        max_concurrency: int = 8
+    ) -> List[Dict[str, Any]]:
+        """Выполняет параллельно несколько `_request` с аргументами из `calls`, сохраняя порядок ответов."""
+        return self.run_concurrently(
+            [lambda call=call: self._request(**call) for call in calls],
+            max_concurrency=max_concurrency,
+        )
 
     def check_api(self) -> bool:
         """
@@ -65,10 +285,9 @@ class BaseClient(ABC):
         Raises:
         APIError: При ошибке HTTP запроса.
         """
-        endpoint = '/indexer/v1/indexes'
-        headers = {'x-folder-id': self.folder_id}
+        endpoint = INDEXES_ENDPOINT
         try:
-            self._request(method='GET', endpoint=endpoint, headers=headers)
+            self._request(method='GET', endpoint=endpoint)
             return True
         except APIError:
             raise
@@ -76,34 +295,46 @@ class BaseClient(ABC):
     def create_or_update_index(
         self,
         index_name: str,
-        documents: List[Dict[str, Any]],
+        documents: List[Union[Dict[str, Any], PreSerializedDoc]],
         meta: Optional[Dict[str, Any]] = None,
         auto_switch: Optional[bool] = None,
         diff: Optional[bool] = None,
-        index_version: Optional[int] = None
+        index_version: Optional[int] = None,
+        batch_size: Optional[int] = None
     ) -> Dict[str, Any]:
         """
         Создание индекса или обновление существующего.
 
         Args:
             index_name: Строковое имя индекса (обязательное). Обязано содержать переданый префикс, после обработки заявки на подключение.
-            documents: Список документов для индексации.
+            documents: Список документов для индексации. Документ можно передать заранее сериализованным
+                через `serialize_document` - тогда он отправляется без повторной сериализации.
             meta: Метаинформация об индексе.
             auto_switch: Флаг автоматического переключения на новый индекс после создания.
             diff: Флаг, указывающий, что нужно создать индекс на основе текущего. **Не использовать для создания нового индекса.**
             index_version: Версия индекса.
+            batch_size: Максимальное количество документов в одном запросе. Если не указан, все документы отправляются одним запросом.
 
         Returns:
-            Dict с данными ответа от API
+            Dict с данными ответа от API. При загрузке пачками содержит ответ на последнюю пачку,
+            а в ключе 'batches' - список ответов на все пачки.
 
         Raises:
-            APIError: При ошибке HTTP запроса.
+            APIError: При ошибке HTTP запроса. При загрузке пачками в сообщении указано,
+                сколько пачек уже было применено.
+            ValueError: Если `batch_size` меньше 1 или передан без `diff=True` и `auto_switch=True`.
 
         Note:
         Из-за особенностей API, флаг `diff=True` предназначен **строго для обновления**
         существующих индексов. Его передача при создании нового индекса с нуля
         приведет к ошибке.
 
+        Загрузка пачками (`batch_size`) поддерживается только для дополнения существующего индекса:
+        с `diff=True`, `auto_switch=True` и без `index_version`. Каждая пачка создает новую версию
+        на основе текущей активной, поэтому пачки отправляются последовательно, и после каждой
+        активная версия содержит все ранее загруженные документы. Полную пересборку индекса
+        (`diff=False`) нужно выполнять одним запросом.
+
         Example:
         # Правильно: обновление существующего индекса
         client.create_or_update_index(
@@ -119,26 +350,48 @@ class BaseClient(ABC):
             diff=True  # Так делать нельзя, приведет к ошибке!
         )
         """
-        endpoint = f'/indexer/v1/indexes/{index_name}/documents'
-        body = {
-            "service": self.service,
-            "product": self.product,
-            "documents": documents,
-        }
-        if index_version is not None:
-            body["index_version"] = index_version
-        if meta is not None:
-            body["meta"] = meta
-        if auto_switch is not None:
-            body["auto_switch"] = auto_switch
-        if diff is not None:
-            body["diff"] = diff
-        return self._request(method='POST', endpoint=endpoint, json=body)
+        if batch_size is not None:
+            if batch_size < 1:
+                raise ValueError("`batch_size` должен быть не меньше 1.")
+            if diff is not True or auto_switch is not True or index_version is not None:
+                raise ValueError(
+                    "Загрузка пачками (`batch_size`) поддерживается только с `diff=True`, "
+                    "`auto_switch=True` и без `index_version`."
+                )
+
+        endpoint = f'{INDEXES_ENDPOINT}/{index_name}/documents'
+        body = _without_none(
+            service=self.service,
+            product=self.product,
+            documents=documents,
+            index_version=index_version,
+            meta=meta,
+            auto_switch=auto_switch,
+            diff=diff,
+        )
+        if batch_size is None or len(documents) <= batch_size:
+            return self._request(method='POST', endpoint=endpoint, json=body)
+
+        batches = []
+        batches_total = (len(documents) + batch_size - 1) // batch_size
+        for start in range(0, len(documents), batch_size):
+            batch_body = dict(body, documents=documents[start:start + batch_size])
+            try:
+                batches.append(self._request(method='POST', endpoint=endpoint, json=batch_body))
+            except APIError as e:
+                raise APIError(
+                    f"Ошибка при загрузке пачки {len(batches) + 1} из {batches_total}, "
+                    f"уже применено пачек: {len(batches)} - {e}",
+                    status_code=e.status_code,
+                    headers=e.headers,
+                ) from e
+        return {**batches[-1], 'batches': batches}
 
     def get_index_info(
         self,
         index_name: str,
-        index_version: Optional[int] = None
+        index_version: Optional[int] = None,
+        cache_ttl: Optional[float] = None
     ) -> Dict[str, Any]:
         """
         Получение подробной информации о конкретной версии индекса.
@@ -146,6 +399,7 @@ class BaseClient(ABC):
         Args:
             index_name: Имя индекса, информацию о котором нужно получить (обязательный).
             index_version: Версия индекса. Если не указана, то API вернет информацию о текущей активной версии.
+            cache_ttl: Время в секундах, в течение которого повторный такой же запрос возвращает закэшированный ответ. По умолчанию кэш не используется.
 
         Returns:
             Dict с данными ответа от API
@@ -153,19 +407,19 @@ class BaseClient(ABC):
         Raises:
             APIError: При ошибке HTTP запроса или проблемах с сетью.
         """
-        endpoint = f'/indexer/v1/indexes/{index_name}'
-        body = {
-            "service": self.service,
-            "product": self.product,
-        }
-        if index_version is not None:
-            body["index_version"] = index_version
-        return self._request(method='GET', endpoint=endpoint, json=body)
+        endpoint = f'{INDEXES_ENDPOINT}/{index_name}'
+        body = _without_none(
+            service=self.service,
+            product=self.product,
+            index_version=index_version,
+        )
+        return self._cached_get(endpoint, cache_ttl, json=body)
 
     def get_indexes_full(
         self,
         page: Optional[int] = None,
-        size: Optional[int] = None
+        size: Optional[int] = None,
+        cache_ttl: Optional[float] = None
     ) -> Dict[str, Any]:
         """
         Получение имен и метаданных всех индексов, на которые у пользователя есть права.
@@ -173,6 +427,7 @@ class BaseClient(ABC):
         Args:
             page: Номер страницы для постраничной загрузки (по умолчанию 1).
             size: Количество записей на странице (по умолчанию 10).
+            cache_ttl: Время в секундах, в течение которого повторный такой же запрос возвращает закэшированный ответ. По умолчанию кэш не используется.
 
         Returns:
             Dict с данными ответа от API
@@ -180,16 +435,14 @@ class BaseClient(ABC):
         Raises:
             APIError: При ошибке HTTP запроса.
         """
-        endpoint = '/indexer/v1/indexes'
-        params = {
-            "service": self.service,
-            "product": self.product,
-        }
-        if page is not None:
-            params["page"] = page
-        if size is not None:
-            params["size"] = size
-        return self._request(method='GET', endpoint=endpoint, params=params)
+        endpoint = INDEXES_ENDPOINT
+        params = _without_none(
+            service=self.service,
+            product=self.product,
+            page=page,
+            size=size,
+        )
+        return self._cached_get(endpoint, cache_ttl, params=params)
 
     def get_documents_from_index(
         self,
@@ -201,6 +454,7 @@ class BaseClient(ABC):
         limit: Optional[int] = None,
         sort_by: Optional[str] = None,
         sort_order: Optional[str] = None,
+        cache_ttl: Optional[float] = None,
     ) -> Dict[str, Any]:
         """
         Получение документов из индекса.
@@ -214,6 +468,7 @@ class BaseClient(ABC):
             limit: Максимальное количество документов на запрос.
             sort_by: Поле для сортировки.
             sort_order: Порядок сортировки (asc или desc).
+            cache_ttl: Время в секундах, в течение которого повторный такой же запрос возвращает закэшированный ответ. По умолчанию кэш не используется.
 
         Returns:
             Dict с данными ответа от API
@@ -221,27 +476,20 @@ class BaseClient(ABC):
         Raises:
             APIError: При ошибке HTTP запроса.
         """
-        endpoint = f'/indexer/v1/indexes/{index_name}/documents'
-        params = {
-            "product": self.product,
-            "service": self.service
-        }
-        if index_version is not None:
-            params["index_version"] = index_version
-        if after_id is not None:
-            params["after_id"] = after_id
-        if search_query is not None:
-            params["search_query"] = search_query
-        if document_id is not None:
-            params["document_id"] = document_id
-        if limit is not None:
-            params["limit"] = limit
-        if sort_by is not None:
-            params["sort_by"] = sort_by
-        if sort_order is not None:
-            params["sort_order"] = sort_order
-
-        return self._request(method='GET', endpoint=endpoint, params=params)
+        endpoint = f'{INDEXES_ENDPOINT}/{index_name}/documents'
+        params = _without_none(
+            product=self.product,
+            service=self.service,
+            index_version=index_version,
+            after_id=after_id,
+            search_query=search_query,
+            document_id=document_id,
+            limit=limit,
+            sort_by=sort_by,
+            sort_order=sort_order,
+        )
+
+        return self._cached_get(endpoint, cache_ttl, params=params, stream=True)
 
     def get_generative_answer(
         self,
@@ -267,20 +515,65 @@ class BaseClient(ABC):
         Raises:
             APIError: При ошибках HTTP запроса.
         """
-        endpoint = '/api/v1/answer'
-        body = {
-            "service": self.service,
-            "product": self.product,
-            "index_name": index_name,
-            "dialog": dialog
-        }
-        if meta_features is not None:
-            body["meta_features"] = meta_features
-        if options is not None:
-            body["options"] = options
-        if replies is not None:
-            body["replies"] = replies
-        return self._request(method='POST', endpoint=endpoint, json=body, timeout=60)
+        endpoint = ANSWER_ENDPOINT
+        body = _without_none(
+            service=self.service,
+            product=self.product,
+            index_name=index_name,
+            dialog=dialog,
+            meta_features=meta_features,
+            options=options,
+            replies=replies,
+        )
+        return self._request(method='POST', endpoint=endpoint, json=body, timeout=ANSWER_TIMEOUT)
+
+    def get_generative_answers(
+        self,
+        index_name: str,
+        dialogs: List[List[Dict[str, Union[str, int]]]],
+        meta_features: Optional[Dict[str, Any]] = None,
+        replies: int = 1,
+        options: Optional[Dict[str, Any]] = None,
+        max_concurrency: int = 8,
+    ) -> List[Dict[str, Any]]:
+        """
+        Получение генеративных ответов сразу для нескольких диалогов.
+
+        Запросы выполняются параллельно (не более `max_concurrency` одновременно)
+        по общему пулу соединений; остальные параметры одинаковы для всех диалогов.
+
+        Args:
+            index_name: Строковое имя индекса (обязательное). Обязано содержать переданый префикс, после обработки заявки на подключение.
+            dialogs: Список диалогов, каждый в формате `dialog` из `get_generative_answer`.
+            meta_features: Дополнительные метаданные контекста.
+            replies: Количество ответов для генерации.
+            options: Дополнительные параметры процессинга.
+            max_concurrency: Максимальное количество одновременных запросов.
+
+        Returns:
+            Список Dict с данными ответов от API в порядке `dialogs`
+
+        Raises:
+            APIError: При ошибке HTTP запроса для любого из диалогов.
+        """
+        template = _without_none(
+            service=self.service,
+            product=self.product,
+            index_name=index_name,
+            meta_features=meta_features,
+            options=options,
+            replies=replies,
+        )
+        calls = [
+            {
+                'method': 'POST',
+                'endpoint': ANSWER_ENDPOINT,
+                'json': {**template, 'dialog': dialog},
+                'timeout': ANSWER_TIMEOUT,
+            }
+            for dialog in dialogs
+        ]
+        return self._request_concurrently(calls, max_concurrency=max_concurrency)
 
     def switch_index_version(
         self,
@@ -300,7 +593,7 @@ class BaseClient(ABC):
         Raises:
             APIError: При ошибке HTTP запроса.
         """
-        endpoint = f'/indexer/v1/indexes/{index_name}/switch_version'
+        endpoint = f'{INDEXES_ENDPOINT}/{index_name}/switch_version'
         body = {
             "service": self.service,
             "product": self.product,
@@ -330,16 +623,14 @@ class BaseClient(ABC):
         Raises:
             APIError: При ошибке HTTP запроса.
         """
-        endpoint = f'/indexer/v1/indexes/{index_name}/documents'
-        params = {
-            "service": self.service,
-            "product": self.product,
-            "docs_ids": docs_ids
-        }
-        if index_version is not None:
-            params["index_version"] = index_version
-        if auto_switch is not None:
-            params["auto_switch"] = auto_switch
+        endpoint = f'{INDEXES_ENDPOINT}/{index_name}/documents'
+        params = _without_none(
+            service=self.service,
+            product=self.product,
+            docs_ids=docs_ids,
+            index_version=index_version,
+            auto_switch=auto_switch,
+        )
         return self._request(method='DELETE', endpoint=endpoint, params=params)
 
     def delete_index(
@@ -358,7 +649,7 @@ class BaseClient(ABC):
         Raises:
             APIError: При ошибке HTTP запроса.
         """
-        endpoint = f'/indexer/v1/indexes/{index_name}/delete'
+        endpoint = f'{INDEXES_ENDPOINT}/{index_name}/delete'
         body = {
             "service": self.service,
             "product": self.product
@@ -377,7 +668,8 @@ class YandexCloudNeuroSupportClient(BaseClient):
         folder_id: str,
         service: str,
         product: str,
-        base_url: str = "https://supportgpt.api.cloud.yandex.net"
+        base_url: str = "https://supportgpt.api.cloud.yandex.net",
+        compress_requests: bool = False
     ):
         """
         Инициализирует клиент API для NeuroSupport в Yandex.Cloud.
@@ -388,6 +680,7 @@ class YandexCloudNeuroSupportClient(BaseClient):
             service: Идентификатор сервиса. Выдается после обработки заявки на подключение (обязательный).
             product: Идентификатор продукта. Выдается после обработки заявки на подключение (обязательный).
             base_url: Базовый URL API.
+            compress_requests: Сжимать gzip тела запросов больше 1 КБ (например, при загрузке документов).
         """
         if not auth_token or not folder_id:
             raise AuthenticationError("`auth_token` и `folder_id` являются обязательными.")
@@ -395,10 +688,10 @@ class YandexCloudNeuroSupportClient(BaseClient):
         self.auth_token = auth_token
         self.folder_id = folder_id
 
-        super().__init__(service=service, product=product, base_url=base_url)
+        super().__init__(service=service, product=product, base_url=base_url, compress_requests=compress_requests)
 
     def _configure_auth(self):
         """
-        Реализует настройку аутентификации с помощью Bearer IAM-токена.
+        Реализует настройку аутентификации с помощью Bearer IAM-токена и каталога (x-folder-id).
         """
-        self.session.headers.update({'Authorization': f'Bearer {self.auth_token}'})
\ No newline at end of file
+        self.session.headers.update({'Authorization': f'Bearer {self.auth_token}', 'x-folder-id': self.folder_id})
\ No newline at end of file
@@ -1,7 +1,24 @@
+from typing import Mapping, Optional
+
+
 class APIError(Exception):
-    """Базовая ошибка API."""
-    pass
+    """
+    Базовая ошибка API.
+
+    Attributes:
+        status_code: HTTP-код ответа, если ошибка пришла от сервера.
+        headers: Заголовки ответа (например, x-request-id для обращения в поддержку).
+    """
+    def __init__(
+        self,
+        message: str,
+        status_code: Optional[int] = None,
+        headers: Optional[Mapping[str, str]] = None
+    ):
+        super().__init__(message)
+        self.status_code = status_code
+        self.headers = headers
 
 class AuthenticationError(APIError):
     """Ошибка аутентификации."""
-    pass
\ No newline at end of file
+    pass
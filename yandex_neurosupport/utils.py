@@ -1,6 +1,125 @@
+import json
 import re
 import subprocess
-from typing import Optional, Union, List, Dict, Any
+import threading
+import time
+from functools import lru_cache
+from typing import Optional, Union, List, Dict, Any, Tuple, Callable, Iterable
+
+from ._mask import mask_tree
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ijson
+    # Чистый Python-бэкенд медленнее C-бэкенда yajl2_c, но, в отличие от него,
+    # разбирает целые числа больше int64 без ошибки.
+    _ijson_backend = ijson.get_backend('python')
+except ImportError:
+    ijson = None
+    _ijson_backend = None
+
+try:
+    import hyperscan
+except ImportError:
+    hyperscan = None
+
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+
+# Целые вне диапазона int64/uint64 orjson при разборе превращает во float с потерей точности.
+# Такие числа содержат не меньше 20 цифр, а отрицательные - не меньше 19.
+_LONG_NUMBER_RE = re.compile(rb'-\d{19}|\d{20}')
+
+
+def _json_dumps(data: Any) -> bytes:
+    """
+    Сериализует данные в JSON (UTF-8). Использует orjson, если он установлен.
+
+    Целые числа, не помещающиеся в 64 бита, сериализуются через стандартный json.
+    Обратите внимание: orjson записывает NaN и бесконечности как null,
+    тогда как без orjson в этом случае выбрасывается ValueError.
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            pass
+    return json.dumps(data, ensure_ascii=False, allow_nan=False, separators=(',', ':')).encode('utf-8')
+
+def _json_loads(data: bytes) -> Any:
+    """
+    Десериализует JSON. Использует orjson, если он установлен.
+    Если в данных есть длинные числа, которые orjson разобрал бы с потерей точности,
+    или orjson отверг данные (например, NaN или 1e400), используется стандартный json.
+    """
+    if orjson is not None and not _LONG_NUMBER_RE.search(data):
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(data)
+
+PreSerializedDoc = bytes
+
+
+def serialize_document(document: Dict[str, Any]) -> PreSerializedDoc:
+    """
+    Заранее сериализует документ в JSON для `create_or_update_index`.
+
+    Такой документ вставляется в тело запроса как есть, без повторной сериализации,
+    что экономит время при многократной загрузке одних и тех же документов.
+    """
+    return _json_dumps(document)
+
+def _dumps_request_body(body: Dict[str, Any]) -> bytes:
+    """
+    Сериализует тело запроса. Заранее сериализованные документы (bytes) из поля
+    `documents` вставляются в результат без повторной сериализации.
+    """
+    documents = body.get("documents")
+    if not documents or not any(isinstance(d, bytes) for d in documents):
+        return _json_dumps(body)
+    head = _json_dumps({k: v for k, v in body.items() if k != "documents"})
+    items = b','.join(d if isinstance(d, bytes) else _json_dumps(d) for d in documents)
+    separator = b',' if head != b'{}' else b''
+    return head[:-1] + separator + b'"documents":[' + items + b']}'
+
+def _json_load_chunks(chunks: Iterable[bytes]) -> Any:
+    """
+    Десериализует JSON, приходящий частями (например, из потокового HTTP-ответа).
+
+    Если установлен ijson, разбор идет инкрементально по мере получения данных,
+    и тело ответа целиком в памяти не накапливается. Иначе части склеиваются
+    и разбираются через `_json_loads`. Для пустого потока возвращает None.
+
+    Raises:
+        ValueError: Если данные не являются корректным JSON.
+    """
+    if ijson is None:
+        data = b''.join(chunks)
+        return _json_loads(data) if data else None
+
+    results = ijson.sendable_list()
+    parser = None
+    try:
+        for chunk in chunks:
+            if chunk:
+                if parser is None:
+                    parser = _ijson_backend.items_coro(results, '', use_float=True)
+                parser.send(chunk)
+        if parser is None:
+            return None
+        parser.close()
+    except ijson.JSONError as e:
+        raise ValueError(str(e)) from e
+    return results[0]
 
 
 def get_folder_id(folder_id: str) -> str:
@@ -19,12 +138,32 @@ def get_index_name(index: str) -> str:
     """Получает prefix index. Выдается после обработки заявки на подключение"""
     return index
 
-def get_iam_token() -> Optional[str]:
-    """Получает IAM-токен через yc CLI."""
+IAM_TOKEN_TTL = 11 * 3600
+IAM_TOKEN_REFRESH_MARGIN = 60
+
+_iam_token_cache: Optional[Tuple[str, float]] = None
+
+def get_iam_token(ttl: int = IAM_TOKEN_TTL) -> Optional[str]:
+    """
+    Получает IAM-токен через yc CLI.
+
+    Полученный токен кэшируется в процессе на `ttl` секунд (IAM-токен действует до 12 часов),
+    поэтому повторные вызовы не запускают yc заново.
+
+    Args:
+        ttl: Время жизни закэшированного токена в секундах. При `ttl=0` токен всегда запрашивается заново.
+    """
+    global _iam_token_cache
+    if ttl > 0 and _iam_token_cache is not None:
+        token, expires_at = _iam_token_cache
+        if time.time() < expires_at - IAM_TOKEN_REFRESH_MARGIN:
+            return token
     try:
         result = subprocess.run(['yc', 'iam', 'create-token'],
                                 capture_output=True, text=True, check=True)
-        return result.stdout.strip()
+        token = result.stdout.strip()
+        _iam_token_cache = (token, time.time() + ttl)
+        return token
     except subprocess.CalledProcessError as e:
         print(f"Ошибка при получении IAM-токена: {e}")
         return None
@@ -32,6 +171,138 @@ def get_iam_token() -> Optional[str]:
         print("Команда 'yc' не найдена. Убедитесь, что Yandex Cloud CLI установлен.")
         return None
 
+def _replace_spans(text, matches: Iterable[Tuple[int, int, int]], placeholder):
+    """
+    Заменяет на плейсхолдер непересекающиеся совпадения `(start, priority, end)` в строке или байтах.
+    Как и в регулярном выражении с альтернацией, выигрывает самое левое совпадение,
+    а среди начинающихся в одной позиции - с наименьшим `priority`.
+    """
+    parts = []
+    position = 0
+    for start, _, end in sorted(matches):
+        if start < position:
+            continue
+        parts.append(text[position:start])
+        parts.append(placeholder)
+        position = end
+    if not parts:
+        return text
+    parts.append(text[position:])
+    return text[:0].join(parts)
+
+
+@lru_cache(maxsize=1)
+def _case_fold_special_chars() -> 're.Pattern[str]':
+    """
+    Возвращает регулярное выражение, находящее символы, для которых сравнение через
+    `str.lower()` расходится с `re.IGNORECASE` (например, 'ſ', 'ı', 'İ', 'ᲀ').
+
+    Строки и значения с такими символами маскируются через re, чтобы все реализации
+    маскирования давали одинаковый результат. Набор вычисляется один раз по текущей
+    версии Unicode в Python.
+    """
+    cased = [c for c in map(chr, range(0x20000)) if c.lower() != c or c.upper() != c]
+    special = {c for c in cased if len(c.lower()) != 1 or c.upper().lower() != c.lower()}
+    alphabet = ''.join(cased)
+    for c in cased:
+        for other in re.findall(re.escape(c), alphabet, re.IGNORECASE):
+            if other.lower() != c.lower() and c not in special and other not in special:
+                special.update((c, other))
+    return re.compile('[' + ''.join(re.escape(c) for c in sorted(special)) + ']')
+
+
+def _hyperscan_value_masker(
+    values: Tuple[str, ...],
+    placeholder: str,
+    fallback: Callable[[str], str]
+) -> Callable[[str], str]:
+    """Строит функцию маскирования на базе Hyperscan (все значения ищутся за один проход)."""
+    database = hyperscan.Database()
+    database.compile(
+        expressions=[re.escape(v).encode('utf-8') for v in values],
+        ids=list(range(len(values))),
+        elements=len(values),
+        flags=(hyperscan.HS_FLAG_CASELESS | hyperscan.HS_FLAG_UTF8
+               | hyperscan.HS_FLAG_UCP | hyperscan.HS_FLAG_SOM_LEFTMOST),
+    )
+    placeholder_bytes = placeholder.encode('utf-8')
+    scan_lock = threading.Lock()
+    special_chars = _case_fold_special_chars()
+
+    def _mask(text: str) -> str:
+        if special_chars.search(text):
+            return fallback(text)
+        try:
+            data = text.encode('utf-8')
+        except UnicodeEncodeError:
+            return fallback(text)
+        matches = []
+        with scan_lock:
+            database.scan(
+                data,
+                match_event_handler=lambda id_, start, end, flags, context: matches.append((start, id_, end)),
+            )
+        if not matches:
+            return text
+        return _replace_spans(data, matches, placeholder_bytes).decode('utf-8')
+
+    return _mask
+
+def _ahocorasick_value_masker(
+    values: Tuple[str, ...],
+    placeholder: str,
+    fallback: Callable[[str], str]
+) -> Callable[[str], str]:
+    """Строит функцию маскирования на базе автомата Ахо-Корасик (поиск по строке в нижнем регистре)."""
+    automaton = ahocorasick.Automaton()
+    for priority, value in enumerate(values):
+        word = value.lower()
+        if not automaton.exists(word):
+            automaton.add_word(word, (priority, len(word)))
+    automaton.make_automaton()
+    special_chars = _case_fold_special_chars()
+
+    def _mask(text: str) -> str:
+        if special_chars.search(text):
+            return fallback(text)
+        lowered = text.lower()
+        matches = [
+            (end - length + 1, priority, end + 1)
+            for end, (priority, length) in automaton.iter(lowered)
+        ]
+        if not matches:
+            return text
+        return _replace_spans(text, matches, placeholder)
+
+    return _mask
+
+@lru_cache(maxsize=128)
+def _value_masker(values: Tuple[str, ...], placeholder: str) -> Callable[[str], str]:
+    """
+    Возвращает функцию, регистронезависимо заменяющую вхождения `values` в строке на `placeholder`.
+    Использует Hyperscan или pyahocorasick, если они установлены, иначе - модуль re.
+    Все реализации дают одинаковый результат: строки и значения с символами, регистр
+    которых `str.lower()` и `re.IGNORECASE` понимают по-разному, обрабатываются через re.
+    """
+    pattern = '|'.join(re.escape(v) for v in values)
+    value_mask_regex = re.compile(pattern, re.IGNORECASE)
+    # Плейсхолдер подставляется буквально, как и в остальных реализациях.
+    replacement = placeholder.replace('\\', '\\\\')
+
+    def _regex_mask(text: str) -> str:
+        return value_mask_regex.sub(replacement, text)
+
+    if (hyperscan is None and ahocorasick is None) or any(_case_fold_special_chars().search(v) for v in values):
+        return _regex_mask
+    if hyperscan is not None:
+        try:
+            return _hyperscan_value_masker(values, placeholder, _regex_mask)
+        except hyperscan.error:
+            pass
+    if ahocorasick is not None:
+        return _ahocorasick_value_masker(values, placeholder, _regex_mask)
+    return _regex_mask
+
 def mask_response_fields(
     data: Union[Dict, List, Any],
     keys_to_mask: Optional[List[str]] = None,
@@ -53,7 +324,8 @@ def mask_response_fields(
         placeholder: Строка, используемая для замены.
 
     Returns:
-        Данные с замаскированными значениями.
+        Данные с замаскированными значениями. Входные данные не изменяются;
+        вложенные словари и списки, в которых нечего маскировать, возвращаются без копирования.
 
     Examples:
     1.
@@ -69,32 +341,11 @@ def mask_response_fields(
     keys_to_mask = keys_to_mask or []
     values_to_mask = values_to_mask or []
 
-    lower_keys_to_mask = {k.lower() for k in keys_to_mask}
+    lower_keys_to_mask = frozenset(k.lower() for k in keys_to_mask)
 
-    value_mask_regex = None
-    filtered_values = [v for v in values_to_mask if v]
+    value_masker = None
+    filtered_values = tuple(v for v in values_to_mask if v)
     if filtered_values:
-        pattern = '|'.join(re.escape(v) for v in filtered_values)
-        value_mask_regex = re.compile(pattern, re.IGNORECASE)
-
-    def _mask_recursive(item: Any) -> Any:
-        if isinstance(item, dict):
-            new_dict = {}
-            for k, v in item.items():
-                if k.lower() in lower_keys_to_mask:
-                    new_dict[k] = placeholder
-                else:
-                    new_dict[k] = _mask_recursive(v)
-            return new_dict
-        elif isinstance(item, list):
-            return [_mask_recursive(sub_item) for sub_item in item]
-
-        elif isinstance(item, str):
-            if value_mask_regex:
-                return value_mask_regex.sub(placeholder, item)
-            return item
-
-        else:
-            return item
-
-    return _mask_recursive(data)
\ No newline at end of file
+        value_masker = _value_masker(filtered_values, placeholder)
+
+    return mask_tree(data, lower_keys_to_mask, value_masker, placeholder)